@@ -85,6 +85,9 @@ builtin.module {
   %shift_left_immediate = riscv.slli %c2, 4 : (!riscv.reg) -> !riscv.reg<a0>
   "test.op"(%shift_left_immediate) : (!riscv.reg<a0>) -> ()
 
+  %shift_left_zero = riscv.slli %zero, 4 : (!riscv.reg<zero>) -> !riscv.reg<a0>
+  "test.op"(%shift_left_zero) : (!riscv.reg<a0>) -> ()
+
   %load_float_ptr = riscv.addi %i2, 8 : (!riscv.reg) -> !riscv.reg
   %load_float_known_offset = riscv.flw %load_float_ptr, 4 : (!riscv.reg) -> !riscv.freg<fa0>
   "test.op"(%load_float_known_offset) : (!riscv.freg<fa0>) -> ()
@@ -195,6 +198,10 @@ builtin.module {
 // CHECK-NEXT:   %shift_left_immediate = riscv.li 32 : !riscv.reg<a0>
 // CHECK-NEXT:   "test.op"(%shift_left_immediate) : (!riscv.reg<a0>) -> ()
 
+// CHECK-NEXT:   %shift_left_zero = riscv.get_register : !riscv.reg<zero>
+// CHECK-NEXT:   %shift_left_zero_1 = riscv.mv %shift_left_zero : (!riscv.reg<zero>) -> !riscv.reg<a0>
+// CHECK-NEXT:   "test.op"(%shift_left_zero_1) : (!riscv.reg<a0>) -> ()
+
 // CHECK-NEXT:   %load_float_known_offset = riscv.flw %i2, 12 : (!riscv.reg) -> !riscv.freg<fa0>
 // CHECK-NEXT:   "test.op"(%load_float_known_offset) : (!riscv.freg<fa0>) -> ()
 
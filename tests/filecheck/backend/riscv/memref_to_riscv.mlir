@@ -13,11 +13,9 @@
 // CHECK-NEXT:    %m_f32_1 = builtin.unrealized_conversion_cast %m_f32 : memref<3x2xf32> to !riscv.reg
 // CHECK-NEXT:    %r_1 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
 // CHECK-NEXT:    %c_1 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset = riscv.mul %r_1, %pointer_dim_stride : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset = riscv.slli %r_1, 1 : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %pointer_offset = riscv.add %pointer_dim_offset, %c_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element = riscv.li 4 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %pointer_offset, %bytes_per_element {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %pointer_offset, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer = riscv.add %m_f32_1, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.fsw %offset_pointer, %v_f32_1, 0 {"comment" = "store float value to memref of shape (3, 2)"} : (!riscv.reg, !riscv.freg) -> ()
 memref.store %v_f32, %m_f32[%r, %c] {"nontemporal" = false} : memref<3x2xf32>
@@ -25,11 +23,9 @@ memref.store %v_f32, %m_f32[%r, %c] {"nontemporal" = false} : memref<3x2xf32>
 // CHECK-NEXT:    %m_f32_2 = builtin.unrealized_conversion_cast %m_f32 : memref<3x2xf32> to !riscv.reg
 // CHECK-NEXT:    %r_2 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
 // CHECK-NEXT:    %c_2 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_1 = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_1 = riscv.mul %r_2, %pointer_dim_stride_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_1 = riscv.slli %r_2, 1 : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %pointer_offset_1 = riscv.add %pointer_dim_offset_1, %c_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_1 = riscv.li 4 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_1 = riscv.mul %pointer_offset_1, %bytes_per_element_1 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_1 = riscv.slli %pointer_offset_1, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_1 = riscv.add %m_f32_2, %scaled_pointer_offset_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %x_f32 = riscv.flw %offset_pointer_1, 0 {"comment" = "load float from memref of shape (3, 2)"} : (!riscv.reg) -> !riscv.freg
 // CHECK-NEXT:    %x_f32_1 = builtin.unrealized_conversion_cast %x_f32 : !riscv.freg to f32
@@ -38,16 +34,14 @@ memref.store %v_f32, %m_f32[%r, %c] {"nontemporal" = false} : memref<3x2xf32>
 // CHECK-NEXT:    %v_i32_1 = builtin.unrealized_conversion_cast %v_i32 : i32 to !riscv.reg
 // CHECK-NEXT:    %m_i32_1 = builtin.unrealized_conversion_cast %m_i32 : memref<3xi32> to !riscv.reg
 // CHECK-NEXT:    %c_3 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_2 = riscv.li 4 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_2 = riscv.mul %c_3, %bytes_per_element_2 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_2 = riscv.slli %c_3, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_2 = riscv.add %m_i32_1, %scaled_pointer_offset_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.sw %offset_pointer_2, %v_i32_1, 0 {"comment" = "store int value to memref of shape (3,)"} : (!riscv.reg, !riscv.reg) -> ()
 memref.store %v_i32, %m_i32[%c] {"nontemporal" = false} : memref<3xi32>
 
 // CHECK-NEXT:    %m_i32_2 = builtin.unrealized_conversion_cast %m_i32 : memref<3xi32> to !riscv.reg
 // CHECK-NEXT:    %c_4 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_3 = riscv.li 4 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_3 = riscv.mul %c_4, %bytes_per_element_3 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_3 = riscv.slli %c_4, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_3 = riscv.add %m_i32_2, %scaled_pointer_offset_3 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %x_i32 = riscv.lw %offset_pointer_3, 0 {"comment" = "load word from memref of shape (3,)"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %x_i32_1 = builtin.unrealized_conversion_cast %x_i32 : !riscv.reg to i32
@@ -57,11 +51,9 @@ memref.store %v_i32, %m_i32[%c] {"nontemporal" = false} : memref<3xi32>
 // CHECK-NEXT:    %m_f64_1 = builtin.unrealized_conversion_cast %m_f64 : memref<3x2xf64> to !riscv.reg
 // CHECK-NEXT:    %r_3 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
 // CHECK-NEXT:    %c_5 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_2 = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_2 = riscv.mul %r_3, %pointer_dim_stride_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_2 = riscv.slli %r_3, 1 : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %pointer_offset_2 = riscv.add %pointer_dim_offset_2, %c_5 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_4 = riscv.li 8 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_4 = riscv.mul %pointer_offset_2, %bytes_per_element_4 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_4 = riscv.slli %pointer_offset_2, 3 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_4 = riscv.add %m_f64_1, %scaled_pointer_offset_4 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.fsd %offset_pointer_4, %v_f64_1, 0 {"comment" = "store double value to memref of shape (3, 2)"} : (!riscv.reg, !riscv.freg) -> ()
 memref.store %v_f64, %m_f64[%r, %c] {"nontemporal" = false} : memref<3x2xf64>
@@ -71,24 +63,61 @@ memref.store %v_f64, %m_f64[%r, %c] {"nontemporal" = false} : memref<3x2xf64>
 // CHECK-NEXT:    %scalar_x_i32_1 = builtin.unrealized_conversion_cast %scalar_x_i32 : !riscv.reg to i32
 %scalar_x_i32 = memref.load %m_scalar_i32[] {"nontemporal" = false} : memref<i32>
 
-// CHECK-NEXT:    %scalar_x_i32_2 = builtin.unrealized_conversion_cast %scalar_x_i32_1 : i32 to !riscv.reg
 // CHECK-NEXT:    %m_scalar_i32_2 = builtin.unrealized_conversion_cast %m_scalar_i32 : memref<i32> to !riscv.reg
-// CHECK-NEXT:    riscv.sw %m_scalar_i32_2, %scalar_x_i32_2, 0 {"comment" = "store int value to memref of shape ()"} : (!riscv.reg, !riscv.reg) -> ()
+// CHECK-NEXT:    riscv.sw %m_scalar_i32_2, %scalar_x_i32, 0 {"comment" = "store int value to memref of shape ()"} : (!riscv.reg, !riscv.reg) -> ()
 memref.store %scalar_x_i32, %m_scalar_i32[] {"nontemporal" = false} : memref<i32>
 
 // CHECK-NEXT:    %m_f64_2 = builtin.unrealized_conversion_cast %m_f64 : memref<3x2xf64> to !riscv.reg
 // CHECK-NEXT:    %r_4 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
 // CHECK-NEXT:    %c_6 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_3 = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_3 = riscv.mul %r_4, %pointer_dim_stride_3 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_3 = riscv.slli %r_4, 1 : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %pointer_offset_3 = riscv.add %pointer_dim_offset_3, %c_6 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_5 = riscv.li 8 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_5 = riscv.mul %pointer_offset_3, %bytes_per_element_5 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_5 = riscv.slli %pointer_offset_3, 3 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_5 = riscv.add %m_f64_2, %scaled_pointer_offset_5 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %x_f64 = riscv.fld %offset_pointer_5, 0 {"comment" = "load double from memref of shape (3, 2)"} : (!riscv.reg) -> !riscv.freg
 // CHECK-NEXT:    %x_f64_1 = builtin.unrealized_conversion_cast %x_f64 : !riscv.freg to f64
 %x_f64 = memref.load %m_f64[%r, %c] {"nontemporal" = false} : memref<3x2xf64>
 
+// CHECK-NEXT:    %m_shared_stride = "test.op"() : () -> memref<2x2x3xi32, strided<[3, 3, 1]>>
+%m_shared_stride = "test.op"() : () -> memref<2x2x3xi32, strided<[3, 3, 1]>>
+// CHECK-NEXT:    %m_shared_stride_1 = builtin.unrealized_conversion_cast %m_shared_stride : memref<2x2x3xi32, strided<[3, 3, 1]>> to !riscv.reg
+// CHECK-NEXT:    %r_5 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
+// CHECK-NEXT:    %c_7 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
+// CHECK-NEXT:    %c_8 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
+// CHECK-NEXT:    %pointer_dim_stride = riscv.li 3 : !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_4 = riscv.mul %r_5, %pointer_dim_stride : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_5 = riscv.mul %c_7, %pointer_dim_stride : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_offset_4 = riscv.add %pointer_dim_offset_4, %pointer_dim_offset_5 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_offset_5 = riscv.add %pointer_offset_4, %c_8 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_6 = riscv.slli %pointer_offset_5, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_6 = riscv.add %m_shared_stride_1, %scaled_pointer_offset_6 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_shared_stride = riscv.lw %offset_pointer_6, 0 {"comment" = "load word from memref of shape (2, 2, 3)"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_shared_stride_1 = builtin.unrealized_conversion_cast %x_shared_stride : !riscv.reg to i32
+%x_shared_stride = memref.load %m_shared_stride[%r, %c, %c] {"nontemporal" = false} : memref<2x2x3xi32, strided<[3, 3, 1]>>
+
+// CHECK-NEXT:    %m_reversed = "test.op"() : () -> memref<4xi32, strided<[-1], offset: 3>>
+%m_reversed = "test.op"() : () -> memref<4xi32, strided<[-1], offset: 3>>
+// CHECK-NEXT:    %m_reversed_1 = builtin.unrealized_conversion_cast %m_reversed : memref<4xi32, strided<[-1], offset: 3>> to !riscv.reg
+// CHECK-NEXT:    %c_9 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
+// CHECK-NEXT:    %zero = riscv.get_register : !riscv.reg<zero>
+// CHECK-NEXT:    %pointer_dim_offset_6 = riscv.sub %zero, %c_9 : (!riscv.reg<zero>, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_7 = riscv.slli %pointer_dim_offset_6, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_7 = riscv.add %m_reversed_1, %scaled_pointer_offset_7 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_reversed = riscv.lw %offset_pointer_7, 0 {"comment" = "load word from memref of shape (4,)"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_reversed_1 = builtin.unrealized_conversion_cast %x_reversed : !riscv.reg to i32
+%x_reversed = memref.load %m_reversed[%c] {"nontemporal" = false} : memref<4xi32, strided<[-1], offset: 3>>
+
+// CHECK-NEXT:    %m_broadcast = "test.op"() : () -> memref<4x3xi32, strided<[0, 1]>>
+%m_broadcast = "test.op"() : () -> memref<4x3xi32, strided<[0, 1]>>
+// CHECK-NEXT:    %m_broadcast_1 = builtin.unrealized_conversion_cast %m_broadcast : memref<4x3xi32, strided<[0, 1]>> to !riscv.reg
+// CHECK-NEXT:    %r_6 = builtin.unrealized_conversion_cast %r : index to !riscv.reg
+// CHECK-NEXT:    %c_10 = builtin.unrealized_conversion_cast %c : index to !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_8 = riscv.slli %c_10, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_8 = riscv.add %m_broadcast_1, %scaled_pointer_offset_8 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_broadcast = riscv.lw %offset_pointer_8, 0 {"comment" = "load word from memref of shape (4, 3)"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x_broadcast_1 = builtin.unrealized_conversion_cast %x_broadcast : !riscv.reg to i32
+%x_broadcast = memref.load %m_broadcast[%r, %c] {"nontemporal" = false} : memref<4x3xi32, strided<[0, 1]>>
+
 // CHECK-NEXT:   riscv.assembly_section ".data" {
 // CHECK-NEXT:       riscv.label "global"
 // CHECK-NEXT:       riscv.directive ".word" "0x0,0x3ff00000,0x0,0x40000000"
@@ -119,6 +148,13 @@ memref.store %scalar_x_i32, %m_scalar_i32[] {"nontemporal" = false} : memref<i32
 // CHECK-NEXT:    %m1_4 = builtin.unrealized_conversion_cast %m1_3 : !riscv.reg to memref<1x1xf64>
 %m1 = memref.alloc() : memref<1x1xf64>
 
+// CHECK-NEXT:    %m2 = riscv.li 6 {"comment" = "memref alloc size"} : !riscv.reg
+// CHECK-NEXT:    %m2_1 = riscv.mv %m2 : (!riscv.reg) -> !riscv.reg<a0>
+// CHECK-NEXT:    %m2_2 = riscv_func.call @malloc(%m2_1) : (!riscv.reg<a0>) -> !riscv.reg<a0>
+// CHECK-NEXT:    %m2_3 = riscv.mv %m2_2 : (!riscv.reg<a0>) -> !riscv.reg
+// CHECK-NEXT:    %m2_4 = builtin.unrealized_conversion_cast %m2_3 : !riscv.reg to memref<3xf16>
+%m2 = memref.alloc() : memref<3xf16>
+
 // Check that the malloc external function is declared after lowering
 
 // CHECK-NEXT:    riscv_func.func private @malloc(!riscv.reg<a0>) -> !riscv.reg<a0>
@@ -150,9 +186,7 @@ memref.store %scalar_x_i32, %m_scalar_i32[] {"nontemporal" = false} : memref<i32
 // CHECK-NEXT:    %v_1 = builtin.unrealized_conversion_cast %v : i8 to !riscv.reg
 // CHECK-NEXT:    %m_1 = builtin.unrealized_conversion_cast %m : memref<1xi8> to !riscv.reg
 // CHECK-NEXT:    %d0_1 = builtin.unrealized_conversion_cast %d0 : index to !riscv.reg
-// CHECK-NEXT:    %bytes_per_element = riscv.li 1 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %d0_1, %bytes_per_element {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %d0_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.sw %offset_pointer, %v_1, 0 {"comment" = "store int value to memref of shape (1,)"} : (!riscv.reg, !riscv.reg) -> ()
 memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi8>
 
@@ -168,8 +202,7 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi8>
 // CHECK-NEXT:    %v_1 = builtin.unrealized_conversion_cast %v : i16 to !riscv.reg
 // CHECK-NEXT:    %m_1 = builtin.unrealized_conversion_cast %m : memref<1xi16> to !riscv.reg
 // CHECK-NEXT:    %d0_1 = builtin.unrealized_conversion_cast %d0 : index to !riscv.reg
-// CHECK-NEXT:    %bytes_per_element = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %d0_1, %bytes_per_element {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %d0_1, 1 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.sw %offset_pointer, %v_1, 0 {"comment" = "store int value to memref of shape (1,)"} : (!riscv.reg, !riscv.reg) -> ()
 memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi16>
@@ -186,8 +219,7 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi16>
 // CHECK-NEXT:    %v_1 = builtin.unrealized_conversion_cast %v : i64 to !riscv.reg
 // CHECK-NEXT:    %m_1 = builtin.unrealized_conversion_cast %m : memref<1xi64> to !riscv.reg
 // CHECK-NEXT:    %d0_1 = builtin.unrealized_conversion_cast %d0 : index to !riscv.reg
-// CHECK-NEXT:    %bytes_per_element = riscv.li 8 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %d0_1, %bytes_per_element {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %d0_1, 3 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    riscv.sw %offset_pointer, %v_1, 0 {"comment" = "store int value to memref of shape (1,)"} : (!riscv.reg, !riscv.reg) -> ()
 memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
@@ -208,6 +240,10 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
 // CHECK-NEXT:    %zero_subview = builtin.unrealized_conversion_cast %original : memref<4x3x2xf64> to memref<3x2xf64>
 %zero_subview = memref.subview %original[0, 0, 0][1, 3, 2][1, 1, 1] : memref<4x3x2xf64> to memref<3x2xf64>
 
+// CHECK-NEXT:    "test.op"(%original) : (memref<4x3x2xf64>) -> ()
+%full_subview = memref.subview %original[0, 0, 0][4, 3, 2][1, 1, 1] : memref<4x3x2xf64> to memref<4x3x2xf64>
+"test.op"(%full_subview) : (memref<4x3x2xf64>) -> ()
+
 // CHECK-NEXT:    %static_subview = builtin.unrealized_conversion_cast %original : memref<4x3x2xf64> to !riscv.reg
 // CHECK-NEXT:    %static_subview_1 = riscv.addi %static_subview, 48 {"comment" = "subview offset"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %static_subview_2 = builtin.unrealized_conversion_cast %static_subview_1 : !riscv.reg to memref<3x2xf64, strided<[2, 1], offset: 6>>
@@ -216,16 +252,9 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
 
 // CHECK-NEXT:    %dynamic_subview = builtin.unrealized_conversion_cast %original : memref<4x3x2xf64> to !riscv.reg
 // CHECK-NEXT:    %subview_dim_index = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_1 = riscv.li 0 : !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_2 = riscv.li 0 : !riscv.reg
 // CHECK-NEXT:    %pointer_dim_stride = riscv.li 6 : !riscv.reg
 // CHECK-NEXT:    %pointer_dim_offset = riscv.mul %subview_dim_index, %pointer_dim_stride : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_1 = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_1 = riscv.mul %subview_dim_index_1, %pointer_dim_stride_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_offset = riscv.add %pointer_dim_offset, %pointer_dim_offset_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_offset_1 = riscv.add %pointer_offset, %subview_dim_index_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element = riscv.li 8 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %pointer_offset_1, %bytes_per_element {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %pointer_dim_offset, 3 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer = riscv.add %dynamic_subview, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %dynamic_subview_1 = builtin.unrealized_conversion_cast %offset_pointer : !riscv.reg to memref<3x2xf64, strided<[2, 1], offset: ?>>
 %dynamic_subview = memref.subview %original[%offset, 0, 0][1, 3, 2][1, 1, 1] :
@@ -234,26 +263,44 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
 // CHECK-NEXT:    %larger_original = "test.op"() : () -> memref<5x4x3x2xf64>
 %larger_original = "test.op"() : () -> memref<5x4x3x2xf64>
 // CHECK-NEXT:    %larger_dynamic_subview = builtin.unrealized_conversion_cast %larger_original : memref<5x4x3x2xf64> to !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_3 = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_4 = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_5 = riscv.li 0 : !riscv.reg
-// CHECK-NEXT:    %subview_dim_index_6 = riscv.li 0 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_2 = riscv.li 24 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_2 = riscv.mul %subview_dim_index_3, %pointer_dim_stride_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_3 = riscv.li 6 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_3 = riscv.mul %subview_dim_index_4, %pointer_dim_stride_3 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_offset_2 = riscv.add %pointer_dim_offset_2, %pointer_dim_offset_3 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_dim_stride_4 = riscv.li 2 : !riscv.reg
-// CHECK-NEXT:    %pointer_dim_offset_4 = riscv.mul %subview_dim_index_5, %pointer_dim_stride_4 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_offset_3 = riscv.add %pointer_offset_2, %pointer_dim_offset_4 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %pointer_offset_4 = riscv.add %pointer_offset_3, %subview_dim_index_6 : (!riscv.reg, !riscv.reg) -> !riscv.reg
-// CHECK-NEXT:    %bytes_per_element_1 = riscv.li 8 : !riscv.reg
-// CHECK-NEXT:    %scaled_pointer_offset_1 = riscv.mul %pointer_offset_4, %bytes_per_element_1 {"comment" = "multiply by element size"} : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %subview_dim_index_1 = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
+// CHECK-NEXT:    %subview_dim_index_2 = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
+// CHECK-NEXT:    %pointer_dim_stride_1 = riscv.li 24 : !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_1 = riscv.mul %subview_dim_index_1, %pointer_dim_stride_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_dim_stride_2 = riscv.li 6 : !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_2 = riscv.mul %subview_dim_index_2, %pointer_dim_stride_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_offset = riscv.add %pointer_dim_offset_1, %pointer_dim_offset_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_1 = riscv.slli %pointer_offset, 3 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %offset_pointer_1 = riscv.add %larger_dynamic_subview, %scaled_pointer_offset_1 : (!riscv.reg, !riscv.reg) -> !riscv.reg
 // CHECK-NEXT:    %larger_dynamic_subview_1 = builtin.unrealized_conversion_cast %offset_pointer_1 : !riscv.reg to memref<3x2xf64, strided<[2, 1], offset: ?>>
 %larger_dynamic_subview = memref.subview %larger_original[%offset, %offset, 0, 0][1, 1, 3, 2][1, 1, 1, 1] :
   memref<5x4x3x2xf64> to memref<3x2xf64, strided<[2, 1], offset: ?>>
 
+// CHECK-NEXT:    %tiled_original = "test.op"() : () -> memref<4x8x16xf32>
+%tiled_original = "test.op"() : () -> memref<4x8x16xf32>
+// CHECK-NEXT:    %mixed_subview = builtin.unrealized_conversion_cast %tiled_original : memref<4x8x16xf32> to !riscv.reg
+// CHECK-NEXT:    %subview_dim_index_3 = builtin.unrealized_conversion_cast %offset : index to !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_3 = riscv.slli %subview_dim_index_3, 7 : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_2 = riscv.slli %pointer_dim_offset_3, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_2 = riscv.add %mixed_subview, %scaled_pointer_offset_2 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_3 = riscv.addi %offset_pointer_2, 140 : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %mixed_subview_1 = builtin.unrealized_conversion_cast %offset_pointer_3 : !riscv.reg to memref<3x2xf32, strided<[16, 1], offset: ?>>
+%mixed_subview = memref.subview %tiled_original[%offset, 2, 3][1, 3, 2][1, 1, 1] :
+  memref<4x8x16xf32> to memref<3x2xf32, strided<[16, 1], offset: ?>>
+
+// CHECK-NEXT:    %tile_original = "test.op"() : () -> memref<16x64xf32>
+%tile_original = "test.op"() : () -> memref<16x64xf32>
+// CHECK-NEXT:    %tile = builtin.unrealized_conversion_cast %tile_original : memref<16x64xf32> to !riscv.reg
+// CHECK-NEXT:    %subview_dim_index_4 = builtin.unrealized_conversion_cast %i0 : index to !riscv.reg
+// CHECK-NEXT:    %subview_dim_index_5 = builtin.unrealized_conversion_cast %i1 : index to !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset_4 = riscv.slli %subview_dim_index_4, 6 : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %pointer_offset_1 = riscv.add %pointer_dim_offset_4, %subview_dim_index_5 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset_3 = riscv.slli %pointer_offset_1, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer_4 = riscv.add %tile, %scaled_pointer_offset_3 : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %tile_1 = builtin.unrealized_conversion_cast %offset_pointer_4 : !riscv.reg to memref<4x4xf32, strided<[64, 1], offset: ?>>
+%tile = memref.subview %tile_original[%i0, %i1][4, 4][1, 1] :
+  memref<16x64xf32> to memref<4x4xf32, strided<[64, 1], offset: ?>>
+
 // CHECK-NEXT:  }
 
 // -----
@@ -278,8 +325,7 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
 // CHECK-NEXT:    %pointer_dim_stride = riscv.li 6
 // CHECK-NEXT:    %pointer_dim_offset = riscv.mul %i0_1, %pointer_dim_stride
 // CHECK-NEXT:    %pointer_offset = riscv.add %pointer_dim_offset, %i1_1
-// CHECK-NEXT:    %bytes_per_element = riscv.li 8
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %pointer_offset, %bytes_per_element
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %pointer_offset, 3
 // CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %scaled_pointer_offset
 // CHECK-NEXT:    %v = riscv.fld %offset_pointer, 0
 // CHECK-NEXT:    %v_1 = builtin.unrealized_conversion_cast %v : !riscv.freg to f64
@@ -298,8 +344,7 @@ memref.store %v, %m[%d0] {"nontemporal" = false} : memref<1xi64>
 // CHECK-NEXT:    %pointer_dim_stride = riscv.li 6
 // CHECK-NEXT:    %pointer_dim_offset = riscv.mul %i0_1, %pointer_dim_stride
 // CHECK-NEXT:    %pointer_offset = riscv.add %pointer_dim_offset, %i1_1
-// CHECK-NEXT:    %bytes_per_element = riscv.li 8
-// CHECK-NEXT:    %scaled_pointer_offset = riscv.mul %pointer_offset, %bytes_per_element
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %pointer_offset, 3
 // CHECK-NEXT:    %offset_pointer = riscv.add %m_1, %scaled_pointer_offset
 // CHECK-NEXT:    riscv.fsd %offset_pointer, %v_1, 0
 
@@ -312,3 +357,48 @@ memref.store %v, %m[%i0, %i1] : memref<2x3xf64, strided<[6, 1], offset: ?>>
 %v = memref.load %m[%i0] : memref<2xf64, strided<[?]>>
 
 // CHECK: MemRef memref<2xf64, strided<[?]>> with dynamic stride is not yet implemented
+
+// -----
+
+// Check that constant indices are folded into the immediate of the memory access
+
+%v, %i = "test.op"() : () -> (f32, index)
+%m = "test.op"() : () -> memref<3x2xf32>
+%big = "test.op"() : () -> memref<1024x2xf32>
+%c1 = arith.constant 1 : index
+%c1000 = arith.constant 1000 : index
+
+// CHECK:         %m_1 = builtin.unrealized_conversion_cast %m : memref<3x2xf32> to !riscv.reg
+// CHECK-NEXT:    %c1_1 = builtin.unrealized_conversion_cast %c1 : index to !riscv.reg
+// CHECK-NEXT:    %c1_2 = builtin.unrealized_conversion_cast %c1 : index to !riscv.reg
+// CHECK-NEXT:    riscv.fsw %m_1, %v_1, 12 {"comment" = "store float value to memref of shape (3, 2)"} : (!riscv.reg, !riscv.freg) -> ()
+memref.store %v, %m[%c1, %c1] {"nontemporal" = false} : memref<3x2xf32>
+
+// CHECK-NEXT:    %m_2 = builtin.unrealized_conversion_cast %m : memref<3x2xf32> to !riscv.reg
+// CHECK-NEXT:    %i_1 = builtin.unrealized_conversion_cast %i : index to !riscv.reg
+// CHECK-NEXT:    %c1_3 = builtin.unrealized_conversion_cast %c1 : index to !riscv.reg
+// CHECK-NEXT:    %pointer_dim_offset = riscv.slli %i_1, 1 : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %scaled_pointer_offset = riscv.slli %pointer_dim_offset, 2 {"comment" = "multiply by element size"} : (!riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %offset_pointer = riscv.add %m_2, %scaled_pointer_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %x = riscv.flw %offset_pointer, 4 {"comment" = "load float from memref of shape (3, 2)"} : (!riscv.reg) -> !riscv.freg
+%x = memref.load %m[%i, %c1] {"nontemporal" = false} : memref<3x2xf32>
+
+// Offsets that don't fit in a 12-bit immediate are added to the pointer
+
+// CHECK:         %big_1 = builtin.unrealized_conversion_cast %big : memref<1024x2xf32> to !riscv.reg
+// CHECK-NEXT:    %c1000_1 = builtin.unrealized_conversion_cast %c1000 : index to !riscv.reg
+// CHECK-NEXT:    %c1_4 = builtin.unrealized_conversion_cast %c1 : index to !riscv.reg
+// CHECK-NEXT:    %static_offset = riscv.li 8004 : !riscv.reg
+// CHECK-NEXT:    %offset_pointer_1 = riscv.add %big_1, %static_offset : (!riscv.reg, !riscv.reg) -> !riscv.reg
+// CHECK-NEXT:    %y = riscv.flw %offset_pointer_1, 0 {"comment" = "load float from memref of shape (1024, 2)"} : (!riscv.reg) -> !riscv.freg
+%y = memref.load %big[%c1000, %c1] {"nontemporal" = false} : memref<1024x2xf32>
+
+// -----
+
+// Check that all the words of large globals are emitted
+
+// CHECK:       riscv.assembly_section ".data" {
+// CHECK-NEXT:    riscv.label "large_global"
+// CHECK-NEXT:    riscv.directive ".word" "0x0,0x1,0x2,0x3,0x4,0x5,0x6,0x7,0x8,0x9,0xa,0xb,0xc,0xd,0xe,0xf,0x10,0x11,0x12,0x13,0x14,0x15,0x16,0x17,0x18,0x19,0x1a,0x1b,0x1c,0x1d,0x1e,0x1f,0x20,0x21,0x22,0x23,0x24,0x25,0x26,0x27,0x28,0x29,0x2a,0x2b"
+// CHECK-NEXT:  }
+"memref.global"() <{"sym_name" = "large_global", "sym_visibility" = "public", "type" = memref<44xi32>, "initial_value" = dense<[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41, 42, 43]> : tensor<44xi32>}> : () -> ()
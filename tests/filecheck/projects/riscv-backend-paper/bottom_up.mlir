@@ -49,14 +49,11 @@ func.func public @conv_2d_nchw_fchw_d1_s1_3x3(
 // CHECK-NEXT:      mv t6, t3
 // CHECK-NEXT:      li a4, 10
 // CHECK-NEXT:      mul t6, t6, a4
-// CHECK-NEXT:      li a4, 8
-// CHECK-NEXT:      mul t6, t6, a4                               # multiply by element size
+// CHECK-NEXT:      slli t6, t6, 3                               # multiply by element size
 // CHECK-NEXT:      add t6, t2, t6
 // CHECK-NEXT:      mv a4, t1
-// CHECK-NEXT:      li a3, 8
-// CHECK-NEXT:      mul a3, t3, a3
-// CHECK-NEXT:      li a5, 8
-// CHECK-NEXT:      mul a3, a3, a5                               # multiply by element size
+// CHECK-NEXT:      slli a3, t3, 3
+// CHECK-NEXT:      slli a3, a3, 3                               # multiply by element size
 // CHECK-NEXT:      add a3, t0, a3
 // CHECK-NEXT:      li a5, 3
 // CHECK-NEXT:      scfgwi a5, 64
@@ -422,13 +419,10 @@ func.func public @pooling_nchw_max_d1_s2_3x3(
 // CHECK-NEXT:      mul a2, t2, a2
 // CHECK-NEXT:      li t6, 18
 // CHECK-NEXT:      mul a2, a2, t6
-// CHECK-NEXT:      li t6, 8
-// CHECK-NEXT:      mul a2, a2, t6                               # multiply by element size
+// CHECK-NEXT:      slli a2, a2, 3                               # multiply by element size
 // CHECK-NEXT:      add a2, t1, a2
-// CHECK-NEXT:      li t6, 8
-// CHECK-NEXT:      mul t6, t2, t6
-// CHECK-NEXT:      li t5, 8
-// CHECK-NEXT:      mul t6, t6, t5                               # multiply by element size
+// CHECK-NEXT:      slli t6, t2, 3
+// CHECK-NEXT:      slli t6, t6, 3                               # multiply by element size
 // CHECK-NEXT:      add t6, t0, t6
 // CHECK-NEXT:      li t5, 3
 // CHECK-NEXT:      scfgwi t5, 64
@@ -571,13 +565,10 @@ func.func public @pooling_nchw_sum_d1_s2_3x3(
 // CHECK-NEXT:      mul a2, t2, a2
 // CHECK-NEXT:      li t6, 18
 // CHECK-NEXT:      mul a2, a2, t6
-// CHECK-NEXT:      li t6, 8
-// CHECK-NEXT:      mul a2, a2, t6                               # multiply by element size
+// CHECK-NEXT:      slli a2, a2, 3                               # multiply by element size
 // CHECK-NEXT:      add a2, t1, a2
-// CHECK-NEXT:      li t6, 8
-// CHECK-NEXT:      mul t6, t2, t6
-// CHECK-NEXT:      li t5, 8
-// CHECK-NEXT:      mul t6, t6, t5                               # multiply by element size
+// CHECK-NEXT:      slli t6, t2, 3
+// CHECK-NEXT:      slli t6, t6, 3                               # multiply by element size
 // CHECK-NEXT:      add t6, t0, t6
 // CHECK-NEXT:      li t5, 3
 // CHECK-NEXT:      scfgwi t5, 64
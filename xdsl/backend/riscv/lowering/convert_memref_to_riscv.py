@@ -1,19 +1,25 @@
-from collections.abc import Iterable
+import struct
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache, reduce
 from math import prod
 from typing import Any, cast
 
 from xdsl.backend.riscv.lowering.utils import (
-    cast_operands_to_regs,
+    cast_ops_for_values,
     register_type_for_type,
 )
 from xdsl.builder import ImplicitBuilder
 from xdsl.context import MLContext
-from xdsl.dialects import memref, riscv, riscv_func
+from xdsl.dialects import arith, memref, riscv, riscv_func
 from xdsl.dialects.builtin import (
-    AnyFloat,
+    BFloat16Type,
     DenseIntOrFPElementsAttr,
+    Float16Type,
     Float32Type,
     Float64Type,
+    Float80Type,
+    Float128Type,
+    IntegerAttr,
     IntegerType,
     MemRefType,
     ModuleOp,
@@ -23,7 +29,6 @@ from xdsl.dialects.builtin import (
     SymbolRefAttr,
     UnrealizedConversionCastOp,
 )
-from xdsl.interpreters.ptr import TypedPtr
 from xdsl.ir import Attribute, Operation, Region, SSAValue
 from xdsl.passes import ModulePass
 from xdsl.pattern_rewriter import (
@@ -36,13 +41,28 @@ from xdsl.pattern_rewriter import (
 from xdsl.traits import SymbolTable
 from xdsl.utils.exceptions import DiagnosticException
 
+# Bitwidths of floating-point element types, looked up by type to avoid walking the
+# AnyFloat union on every call.
+_FLOAT_BITWIDTHS: dict[type[Attribute], int] = {
+    float_type: float_type().get_bitwidth
+    for float_type in (
+        BFloat16Type,
+        Float16Type,
+        Float32Type,
+        Float64Type,
+        Float80Type,
+        Float128Type,
+    )
+}
+
 
+@lru_cache(maxsize=128)
 def bitwidth_of_type(type_attribute: Attribute) -> int:
     """
     Returns the width of an element type in bits, or raises DiagnosticException for unknown inputs.
     """
-    if isinstance(type_attribute, AnyFloat):
-        return type_attribute.get_bitwidth
+    if (bitwidth := _FLOAT_BITWIDTHS.get(type(type_attribute))) is not None:
+        return bitwidth
     elif isinstance(type_attribute, IntegerType):
         return type_attribute.width.data
     else:
@@ -51,6 +71,7 @@ def bitwidth_of_type(type_attribute: Attribute) -> int:
         )
 
 
+@lru_cache(maxsize=128)
 def element_size_for_type(type_attribute: Attribute) -> int:
     """
     Returns the width of an element type in bytes, or raises DiagnosticException for
@@ -67,9 +88,14 @@ def element_size_for_type(type_attribute: Attribute) -> int:
 
 
 class ConvertMemrefAllocOp(RewritePattern):
+    contains_malloc: bool
+
+    def __init__(self):
+        self.contains_malloc = False
 
     @op_type_rewrite_pattern
     def match_and_rewrite(self, op: memref.Alloc, rewriter: PatternRewriter) -> None:
+        self.contains_malloc = True
         assert isinstance(op_memref_type := op.memref.type, memref.MemRefType)
         op_memref_type = cast(memref.MemRefType[Any], op_memref_type)
         width_in_bytes = bitwidth_of_type(op_memref_type.element_type) // 8
@@ -90,8 +116,14 @@ class ConvertMemrefAllocOp(RewritePattern):
 
 
 class ConvertMemrefDeallocOp(RewritePattern):
+    contains_dealloc: bool
+
+    def __init__(self):
+        self.contains_dealloc = False
+
     @op_type_rewrite_pattern
     def match_and_rewrite(self, op: memref.Dealloc, rewriter: PatternRewriter) -> None:
+        self.contains_dealloc = True
         rewriter.replace_matched_op(
             (
                 ptr := UnrealizedConversionCastOp.get(
@@ -107,96 +139,377 @@ class ConvertMemrefDeallocOp(RewritePattern):
         )
 
 
-def get_strided_pointer(
+def _get_constant_index(value: SSAValue) -> int | None:
+    """
+    Returns the value of the index if it is known at compile time, looking through
+    conversion casts, or None otherwise.
+    """
+    owner = value.owner
+    if isinstance(owner, UnrealizedConversionCastOp) and len(owner.inputs) == 1:
+        return _get_constant_index(owner.inputs[0])
+    if isinstance(owner, riscv.LiOp) and isinstance(owner.immediate, IntegerAttr):
+        return owner.immediate.value.data
+    if isinstance(owner, arith.Constant) and isinstance(owner.value, IntegerAttr):
+        return cast(IntegerAttr[Any], owner.value).value.data
+    return None
+
+
+def _fold_offset(ptr: SSAValue, offset: int) -> tuple[list[Operation], SSAValue, int]:
+    """
+    Returns the operations required to add a static byte `offset` to 'ptr', the
+    resulting pointer, and the remaining offset. If the offset fits in a 12-bit signed
+    immediate, no operations are emitted and the offset is returned unchanged, to be
+    used as the immediate of the consuming instruction.
+    """
+    min_imm, max_imm = riscv.si12.value_range()
+    if min_imm <= offset < max_imm:
+        return [], ptr, offset
+
+    offset_op = riscv.LiOp(offset)
+    ptr_op = riscv.AddOp(ptr, offset_op.rd, rd=riscv.Registers.UNALLOCATED_INT)
+    offset_op.rd.name_hint = "static_offset"
+    ptr_op.rd.name_hint = "offset_pointer"
+    return [offset_op, ptr_op], ptr_op.rd, 0
+
+
+def _maybe_shift(
+    value: SSAValue,
+    factor: int,
+    *,
+    factor_name_hint: str,
+    result_name_hint: str,
+    comment: str | None = None,
+    constants: dict[int, SSAValue] | None = None,
+) -> tuple[list[Operation], SSAValue]:
+    """
+    Returns the operations multiplying 'value' by the constant 'factor', and the
+    resulting value. Multiplying by one is a noop, multiplying by minus one is a
+    subtraction from zero, and multiplying by a power of two is strength-reduced to a
+    left shift, otherwise the factor is loaded into a register.
+    If 'constants' is passed, factors already loaded into registers are reused, and
+    newly loaded factors are added to it.
+    """
+    if factor == 1:
+        return [], value
+
+    if factor == -1:
+        zero_op = riscv.GetRegisterOp(riscv.Registers.ZERO)
+        zero_op.res.name_hint = "zero"
+        neg_op = riscv.SubOp(
+            zero_op, value, rd=riscv.Registers.UNALLOCATED_INT, comment=comment
+        )
+        neg_op.rd.name_hint = result_name_hint
+        return [zero_op, neg_op], neg_op.rd
+
+    if factor > 0 and not factor & (factor - 1):
+        shift_op = riscv.SlliOp(
+            value,
+            factor.bit_length() - 1,
+            rd=riscv.Registers.UNALLOCATED_INT,
+            comment=comment,
+        )
+        shift_op.rd.name_hint = result_name_hint
+        return [shift_op], shift_op.rd
+
+    ops: list[Operation] = []
+    if constants is not None and factor in constants:
+        factor_value = constants[factor]
+    else:
+        factor_op = riscv.LiOp(factor)
+        factor_op.rd.name_hint = factor_name_hint
+        ops.append(factor_op)
+        factor_value = factor_op.rd
+        if constants is not None:
+            constants[factor] = factor_value
+
+    mul_op = riscv.MulOp(
+        value, factor_value, rd=riscv.Registers.UNALLOCATED_INT, comment=comment
+    )
+    mul_op.rd.name_hint = result_name_hint
+    ops.append(mul_op)
+    return ops, mul_op.rd
+
+
+def _offset_pointer(
     src_ptr: SSAValue,
-    indices: Iterable[SSAValue],
-    memref_type: MemRefType[Any],
+    offset: SSAValue,
+    bytes_per_element: int,
+    constants: dict[int, SSAValue] | None = None,
 ) -> tuple[list[Operation], SSAValue]:
     """
-    Given a buffer pointer 'src_ptr' which was originally of type 'memref_type', returns
-    a new pointer to the element being accessed by the 'indices'.
+    Returns the operations adding 'offset', in number of elements, to 'src_ptr', and
+    the resulting pointer.
     """
+    ops, offset_bytes = _maybe_shift(
+        offset,
+        bytes_per_element,
+        factor_name_hint="bytes_per_element",
+        result_name_hint="scaled_pointer_offset",
+        comment="multiply by element size",
+        constants=constants,
+    )
+    ptr_op = riscv.AddOp(src_ptr, offset_bytes, rd=riscv.Registers.UNALLOCATED_INT)
+    ptr_op.rd.name_hint = "offset_pointer"
+    ops.append(ptr_op)
+    return ops, ptr_op.rd
 
-    bytes_per_element = element_size_for_type(memref_type.element_type)
 
+def get_memref_strides(memref_type: MemRefType[Any]) -> tuple[int | None, ...]:
+    """
+    Returns the strides of each dimension of 'memref_type', in number of elements, or
+    None for dynamic strides.
+    """
     match memref_type.layout:
         case NoneAttr():
-            strides = ShapedType.strides_for_shape(memref_type.get_shape())
+            return tuple(ShapedType.strides_for_shape(memref_type.get_shape()))
         case StridedLayoutAttr():
-            strides = memref_type.layout.get_strides()
+            return tuple(memref_type.layout.get_strides())
         case _:
             raise DiagnosticException(f"Unsupported layout type {memref_type.layout}")
 
-    ops: list[Operation] = []
 
-    head: SSAValue | None = None
+def get_strided_pointer_and_offset(
+    src_ptr: SSAValue,
+    indices: Iterable[SSAValue | int],
+    memref_type: MemRefType[Any],
+    *,
+    strides: Sequence[int | None] | None = None,
+) -> tuple[list[Operation], SSAValue, int]:
+    """
+    Given a buffer pointer 'src_ptr' which was originally of type 'memref_type', returns
+    a new pointer and a static offset in bytes, such that their sum points to the
+    element being accessed by the 'indices'. Indices that are known at compile time,
+    either passed as integers or defined by constant operations, contribute to the
+    static offset instead of emitting arithmetic operations.
+
+    Callers that already computed the 'strides' of the memref type can pass them to
+    avoid recomputing them.
+    """
+
+    bytes_per_element = element_size_for_type(memref_type.element_type)
+
+    rank = memref_type.get_num_dims()
+    if not rank:
+        # A rank-0 memref has a single element, at the start of the buffer.
+        return [], src_ptr, 0
+
+    if rank == 1 and isinstance(memref_type.layout, NoneAttr):
+        # A contiguous rank-1 memref has a stride of 1, so the offset in bytes is
+        # the index scaled by the element size.
+        (index,) = indices
+        constant_index = index if isinstance(index, int) else _get_constant_index(index)
+        if constant_index is not None:
+            return [], src_ptr, constant_index * bytes_per_element
+        ops, ptr = _offset_pointer(src_ptr, index, bytes_per_element)
+        return ops, ptr, 0
+
+    if strides is None:
+        strides = get_memref_strides(memref_type)
+
+    if any(stride is None for stride in strides):
+        raise DiagnosticException(
+            f"MemRef {memref_type} with dynamic stride is not yet implemented"
+        )
+    strides = cast(Sequence[int], strides)
+
+    # Split the indices into a static offset, in number of elements, and the
+    # (index, stride) pairs that need to be computed at runtime.
+    static_offset = 0
+    dynamic_pairs: list[tuple[SSAValue, int]] = []
 
     for index, stride in zip(indices, strides, strict=True):
-        # Calculate the offset that needs to be added through the index of the current
-        # dimension.
-        increment = index
-        match stride:
-            case None:
-                raise DiagnosticException(
-                    f"MemRef {memref_type} with dynamic stride is not yet implemented"
-                )
-            case 1:
-                # Stride 1 is a noop making the index equal to the offset.
-                pass
-            case _:
-                # Otherwise, multiply the stride (which by definition is the number of
-                # elements required to be skipped when incrementing that dimension).
-                ops.extend(
-                    (
-                        stride_op := riscv.LiOp(stride),
-                        offset_op := riscv.MulOp(
-                            increment,
-                            stride_op.rd,
-                            rd=riscv.IntRegisterType.unallocated(),
-                        ),
-                    )
-                )
-                stride_op.rd.name_hint = "pointer_dim_stride"
-                offset_op.rd.name_hint = "pointer_dim_offset"
-                increment = offset_op.rd
-
-        if head is None:
-            # First iteration.
-            head = increment
-            continue
-
-        # Otherwise sum up the products.
-        ops.append(
-            add_op := riscv.AddOp(
-                head, increment, rd=riscv.IntRegisterType.unallocated()
-            )
+        if isinstance(index, int):
+            constant_index = index
+        else:
+            constant_index = _get_constant_index(index)
+
+        if constant_index is not None:
+            # The contribution of constant indices is folded into the static offset.
+            static_offset += constant_index * stride
+        elif stride:
+            # Stride 0 means that the index of this dimension is ignored.
+            dynamic_pairs.append((index, stride))
+
+    if not dynamic_pairs:
+        return [], src_ptr, static_offset * bytes_per_element
+
+    # Multiply each index by its stride (which by definition is the number of elements
+    # required to be skipped when incrementing that dimension). Strides shared by
+    # multiple dimensions, or equal to the element size, are only loaded once.
+    constants: dict[int, SSAValue] = {}
+    scaled_indices = [
+        _maybe_shift(
+            index,
+            stride,
+            factor_name_hint="pointer_dim_stride",
+            result_name_hint="pointer_dim_offset",
+            constants=constants,
         )
+        for index, stride in dynamic_pairs
+    ]
+    ops: list[Operation] = [op for stride_ops, _ in scaled_indices for op in stride_ops]
+
+    def add_offsets(lhs: SSAValue, rhs: SSAValue) -> SSAValue:
+        add_op = riscv.AddOp(lhs, rhs, rd=riscv.Registers.UNALLOCATED_INT)
         add_op.rd.name_hint = "pointer_offset"
-        head = add_op.rd
-
-    if head is None:
-        return ops, src_ptr
-
-    ops.extend(
-        [
-            bytes_per_element_op := riscv.LiOp(bytes_per_element),
-            offset_bytes := riscv.MulOp(
-                head,
-                bytes_per_element_op.rd,
-                rd=riscv.IntRegisterType.unallocated(),
-                comment="multiply by element size",
-            ),
-            ptr := riscv.AddOp(
-                src_ptr, offset_bytes, rd=riscv.IntRegisterType.unallocated()
-            ),
-        ]
+        ops.append(add_op)
+        return add_op.rd
+
+    # Sum up the products.
+    head = reduce(add_offsets, (increment for _, increment in scaled_indices))
+
+    ptr_ops, ptr = _offset_pointer(src_ptr, head, bytes_per_element, constants)
+    ops.extend(ptr_ops)
+
+    return ops, ptr, static_offset * bytes_per_element
+
+
+def get_strided_pointer(
+    src_ptr: SSAValue,
+    indices: Iterable[SSAValue | int],
+    memref_type: MemRefType[Any],
+    *,
+    strides: Sequence[int | None] | None = None,
+) -> tuple[list[Operation], SSAValue]:
+    """
+    Given a buffer pointer 'src_ptr' which was originally of type 'memref_type', returns
+    a new pointer to the element being accessed by the 'indices'.
+    """
+
+    ops, ptr, offset = get_strided_pointer_and_offset(
+        src_ptr, indices, memref_type, strides=strides
     )
+    offset_ops, ptr, offset = _fold_offset(ptr, offset)
+    ops.extend(offset_ops)
+
+    if offset:
+        offset_op = riscv.AddiOp(ptr, offset, rd=riscv.Registers.UNALLOCATED_INT)
+        offset_op.rd.name_hint = "offset_pointer"
+        ops.append(offset_op)
+        ptr = offset_op.rd
+
+    return ops, ptr
+
+
+# Store operations and a description of the stored value, keyed by the register type of
+# the value and, for floating-point values, the element type of the memref.
+_STORE_OP_TABLE: dict[
+    tuple[type[Attribute], type[Attribute] | None],
+    tuple[type[riscv.RsRsImmIntegerOperation | riscv.RsRsImmFloatOperation], str],
+] = {
+    (riscv.IntRegisterType, None): (riscv.SwOp, "int value"),
+    (riscv.FloatRegisterType, Float32Type): (riscv.FSwOp, "float value"),
+    (riscv.FloatRegisterType, Float64Type): (riscv.FSdOp, "double value"),
+}
+
+# Load operations and a description of the loaded value, keyed by the register type of
+# the result and, for floating-point values, the element type of the memref.
+_LOAD_OP_TABLE: dict[
+    tuple[type[Attribute], type[Attribute] | None],
+    tuple[type[riscv.RdRsImmIntegerOperation | riscv.RdRsImmFloatOperation], str],
+] = {
+    (riscv.IntRegisterType, None): (riscv.LwOp, "word"),
+    (riscv.FloatRegisterType, Float32Type): (riscv.FLwOp, "float"),
+    (riscv.FloatRegisterType, Float64Type): (riscv.FLdOp, "double"),
+}
+
+
+def _memory_op_key(
+    register_type: type[Attribute], element_type: Attribute
+) -> tuple[type[Attribute], type[Attribute] | None]:
+    """
+    Returns the key of the load and store tables for a value of 'register_type' stored
+    in a memref with elements of 'element_type'.
+    """
+    if register_type is riscv.FloatRegisterType:
+        return register_type, type(element_type)
+    return register_type, None
+
+
+def _unwrap_register_cast(value: SSAValue) -> SSAValue:
+    """
+    If 'value' is the result of a cast from a register of the type it would be lowered
+    to, such as the result of a lowered load, returns that register, otherwise returns
+    'value'.
+    """
+    cast_op = value.owner
+    if (
+        isinstance(cast_op, UnrealizedConversionCastOp)
+        and len(cast_op.inputs) == 1
+        and isinstance(cast_op.inputs[0].type, register_type_for_type(value.type))
+    ):
+        return cast_op.inputs[0]
+    return value
+
+
+def _cast_operands_to_regs(op: Operation) -> tuple[list[Operation], list[SSAValue]]:
+    """
+    Returns cast operations for the operands of 'op' that are not already registers,
+    reusing the source registers of existing casts, and the new operand values.
+    """
+    return cast_ops_for_values([_unwrap_register_cast(o) for o in op.operands])
+
+
+@lru_cache(maxsize=64)
+def _store_lowering(
+    register_type: type[Attribute], memref_type: MemRefType[Any]
+) -> Callable[
+    [SSAValue, SSAValue, Sequence[SSAValue]], tuple[list[Operation], Operation]
+]:
+    """
+    Returns a function lowering a store of a value of 'register_type' to a memref of
+    'memref_type'. The function takes the value, buffer pointer, and index registers, and
+    returns the pointer arithmetic operations and the store operation.
+    """
+    key = _memory_op_key(register_type, memref_type.element_type)
+    assert (
+        key in _STORE_OP_TABLE
+    ), f"Unexpected store of {register_type} to {memref_type}"
+    op_cls, description = _STORE_OP_TABLE[key]
+    strides = get_memref_strides(memref_type)
+    comment = f"store {description} to memref of shape {memref_type.get_shape()}"
+
+    def lower(
+        value: SSAValue, mem: SSAValue, indices: Sequence[SSAValue]
+    ) -> tuple[list[Operation], Operation]:
+        ops, ptr, offset = get_strided_pointer_and_offset(
+            mem, indices, memref_type, strides=strides
+        )
+        offset_ops, ptr, offset = _fold_offset(ptr, offset)
+        ops.extend(offset_ops)
+        return ops, op_cls(ptr, value, offset, comment=comment)
+
+    return lower
+
 
-    bytes_per_element_op.rd.name_hint = "bytes_per_element"
-    offset_bytes.rd.name_hint = "scaled_pointer_offset"
-    ptr.rd.name_hint = "offset_pointer"
+@lru_cache(maxsize=64)
+def _load_lowering(
+    register_type: type[Attribute], memref_type: MemRefType[Any]
+) -> Callable[[SSAValue, Sequence[SSAValue]], tuple[list[Operation], Operation]]:
+    """
+    Returns a function lowering a load of a value of 'register_type' from a memref of
+    'memref_type'. The function takes the buffer pointer and index registers, and
+    returns the pointer arithmetic operations and the load operation.
+    """
+    key = _memory_op_key(register_type, memref_type.element_type)
+    assert (
+        key in _LOAD_OP_TABLE
+    ), f"Unexpected load of {register_type} from {memref_type}"
+    op_cls, description = _LOAD_OP_TABLE[key]
+    strides = get_memref_strides(memref_type)
+    comment = f"load {description} from memref of shape {memref_type.get_shape()}"
+
+    def lower(
+        mem: SSAValue, indices: Sequence[SSAValue]
+    ) -> tuple[list[Operation], Operation]:
+        ops, ptr, offset = get_strided_pointer_and_offset(
+            mem, indices, memref_type, strides=strides
+        )
+        offset_ops, ptr, offset = _fold_offset(ptr, offset)
+        ops.extend(offset_ops)
+        return ops, op_cls(ptr, offset, comment=comment)
 
-    return ops, ptr.rd
+    return lower
 
 
 class ConvertMemrefStoreOp(RewritePattern):
@@ -205,41 +518,12 @@ class ConvertMemrefStoreOp(RewritePattern):
         assert isinstance(op_memref_type := op.memref.type, memref.MemRefType)
         memref_type = cast(memref.MemRefType[Any], op_memref_type)
 
-        value, mem, *indices = cast_operands_to_regs(rewriter)
-
-        shape = memref_type.get_shape()
-        ops, ptr = get_strided_pointer(mem, indices, memref_type)
+        cast_ops, (value, mem, *indices) = _cast_operands_to_regs(op)
 
-        rewriter.insert_op_before_matched_op(ops)
-        match value.type:
-            case riscv.IntRegisterType():
-                new_op = riscv.SwOp(
-                    ptr, value, 0, comment=f"store int value to memref of shape {shape}"
-                )
-            case riscv.FloatRegisterType():
-                float_type = cast(AnyFloat, memref_type.element_type)
-                match float_type:
-                    case Float32Type():
-                        new_op = riscv.FSwOp(
-                            ptr,
-                            value,
-                            0,
-                            comment=f"store float value to memref of shape {shape}",
-                        )
-                    case Float64Type():
-                        new_op = riscv.FSdOp(
-                            ptr,
-                            value,
-                            0,
-                            comment=f"store double value to memref of shape {shape}",
-                        )
-                    case _:
-                        assert False, f"Unexpected floating point type {float_type}"
-
-            case _:
-                assert False, f"Unexpected register type {value.type}"
+        lower = _store_lowering(type(value.type), memref_type)
+        ops, new_op = lower(value, mem, indices)
 
-        rewriter.replace_matched_op(new_op)
+        rewriter.replace_matched_op([*cast_ops, *ops, new_op])
 
 
 class ConvertMemrefLoadOp(RewritePattern):
@@ -250,41 +534,18 @@ class ConvertMemrefLoadOp(RewritePattern):
         ), f"{op.memref.type}"
         memref_type = cast(memref.MemRefType[Any], op_memref_type)
 
-        mem, *indices = cast_operands_to_regs(rewriter)
+        cast_ops, (mem, *indices) = _cast_operands_to_regs(op)
 
-        shape = memref_type.get_shape()
-        ops, ptr = get_strided_pointer(mem, indices, memref_type)
-        rewriter.insert_op_before_matched_op(ops)
-
-        result_register_type = register_type_for_type(op.res.type)
-
-        match result_register_type:
-            case riscv.IntRegisterType:
-                lw_op = riscv.LwOp(
-                    ptr, 0, comment=f"load word from memref of shape {shape}"
-                )
-            case riscv.FloatRegisterType:
-                float_type = cast(AnyFloat, memref_type.element_type)
-                match float_type:
-                    case Float32Type():
-                        lw_op = riscv.FLwOp(
-                            ptr, 0, comment=f"load float from memref of shape {shape}"
-                        )
-                    case Float64Type():
-                        lw_op = riscv.FLdOp(
-                            ptr, 0, comment=f"load double from memref of shape {shape}"
-                        )
-                    case _:
-                        assert False, f"Unexpected floating point type {float_type}"
-
-            case _:
-                assert False, f"Unexpected register type {result_register_type}"
+        lower = _load_lowering(register_type_for_type(op.res.type), memref_type)
+        ops, lw_op = lower(mem, indices)
 
         rewriter.replace_matched_op(
             [
-                lw := lw_op,
-                UnrealizedConversionCastOp.get(lw.results, (op.res.type,)),
-            ],
+                *cast_ops,
+                *ops,
+                lw_op,
+                UnrealizedConversionCastOp.get(lw_op.results, (op.res.type,)),
+            ]
         )
 
 
@@ -310,23 +571,21 @@ class ConvertMemrefGlobalOp(RewritePattern):
                     raise DiagnosticException(
                         f"Unsupported memref element type for riscv lowering: {element_type}"
                     )
-                ints = [d.value.data for d in initial_value.data]
-                for i in ints:
-                    assert isinstance(i, int)
-                ints = cast(list[int], ints)
-                ptr = TypedPtr.new_int32(ints).raw
+                element_format = "i"
             case Float32Type():
-                floats = [d.value.data for d in initial_value.data]
-                ptr = TypedPtr.new_float32(floats).raw
+                element_format = "f"
             case Float64Type():
-                floats = [d.value.data for d in initial_value.data]
-                ptr = TypedPtr.new_float64(floats).raw
+                element_format = "d"
             case _:
                 raise DiagnosticException(
                     f"Unsupported memref element type for riscv lowering: {element_type}"
                 )
 
-        text = ",".join(hex(i) for i in ptr.int32.get_list(42))
+        # Pack all the elements in one call, and reinterpret the buffer as 32-bit words.
+        values = [d.value.data for d in initial_value.data]
+        data = struct.pack(f"<{len(values)}{element_format}", *values)
+        words = struct.unpack(f"<{len(data) // 4}i", data)
+        text = ",".join(map(hex, words))
 
         section = riscv.AssemblySectionOp(".data")
         with ImplicitBuilder(section.data):
@@ -384,53 +643,53 @@ class ConvertMemrefSubviewOp(RewritePattern):
         if isinstance(result_layout_attr, NoneAttr):
             # When a subview has no layout attr, the result is a perfect subview at offset
             # 0.
-            rewriter.replace_matched_op(
-                UnrealizedConversionCastOp.get((source,), (result_type,))
-            )
-            return
-
-        if not isinstance(result_layout_attr, StridedLayoutAttr):
+            offset = 0
+        elif isinstance(result_layout_attr, StridedLayoutAttr):
+            offset = result_layout_attr.get_offset()
+        else:
             raise DiagnosticException("Only strided layout attrs implemented")
 
-        offset = result_layout_attr.get_offset()
-
-        factor = element_size_for_type(result_type.element_type)
-
         if offset == 0:
-            rewriter.replace_matched_op(
-                UnrealizedConversionCastOp.get((source,), (result_type,))
-            )
+            if source_type == result_type:
+                # The subview is the whole source memref, no cast is needed.
+                rewriter.replace_matched_op([], new_results=[source])
+            else:
+                rewriter.replace_matched_op(
+                    UnrealizedConversionCastOp.get((source,), (result_type,))
+                )
             return
 
+        factor = element_size_for_type(result_type.element_type)
+
         src = UnrealizedConversionCastOp.get(
-            (source,), (riscv.IntRegisterType.unallocated(),)
+            (source,), (riscv.Registers.UNALLOCATED_INT,)
         )
         src_rd = src.results[0]
 
         if offset is None:
-            indices: list[SSAValue] = []
+            source_strides = get_memref_strides(source_type)
+            indices: list[SSAValue | int] = []
             index_ops: list[Operation] = []
 
-            dynamic_offset_index = 0
+            dynamic_offsets = iter(op.offsets)
             for static_offset_attr in op.static_offsets.data:
                 static_offset = static_offset_attr.data
                 assert isinstance(static_offset, int)
                 if static_offset == memref.Subview.DYNAMIC_INDEX:
-                    index_ops.append(
-                        cast_index_op := UnrealizedConversionCastOp.get(
-                            (op.offsets[dynamic_offset_index],),
-                            (riscv.IntRegisterType.unallocated(),),
-                        )
+                    cast_index_op = UnrealizedConversionCastOp.get(
+                        (next(dynamic_offsets),), (riscv.Registers.UNALLOCATED_INT,)
                     )
                     index_val = cast_index_op.results[0]
-                    dynamic_offset_index += 1
+                    index_val.name_hint = "subview_dim_index"
+                    index_ops.append(cast_index_op)
+                    indices.append(index_val)
                 else:
-                    # No need to insert arithmetic ops that will be multiplied by zero
-                    index_ops.append(offset_op := riscv.LiOp(static_offset))
-                    index_val = offset_op.rd
-                index_val.name_hint = "subview_dim_index"
-                indices.append(index_val)
-            offset_ops, offset_rd = get_strided_pointer(src_rd, indices, source_type)
+                    # Static offsets are folded into a single immediate, no need to
+                    # load them into registers
+                    indices.append(static_offset)
+            offset_ops, offset_rd = get_strided_pointer(
+                src_rd, indices, source_type, strides=source_strides
+            )
         else:
             factor_op = riscv.AddiOp(
                 src_rd,
@@ -455,16 +714,13 @@ class ConvertMemrefToRiscvPass(ModulePass):
     name = "convert-memref-to-riscv"
 
     def apply(self, ctx: MLContext, op: ModuleOp) -> None:
-        contains_malloc = PatternRewriteWalker(ConvertMemrefAllocOp()).rewrite_module(
-            op
-        )
-        contains_dealloc = PatternRewriteWalker(
-            ConvertMemrefDeallocOp()
-        ).rewrite_module(op)
+        alloc_pattern = ConvertMemrefAllocOp()
+        dealloc_pattern = ConvertMemrefDeallocOp()
         PatternRewriteWalker(
             GreedyRewritePatternApplier(
                 [
-                    ConvertMemrefDeallocOp(),
+                    alloc_pattern,
+                    dealloc_pattern,
                     ConvertMemrefStoreOp(),
                     ConvertMemrefLoadOp(),
                     ConvertMemrefGlobalOp(),
@@ -473,7 +729,7 @@ class ConvertMemrefToRiscvPass(ModulePass):
                 ]
             )
         ).rewrite_module(op)
-        if contains_malloc:
+        if alloc_pattern.contains_malloc:
             func_op = riscv_func.FuncOp(
                 "malloc",
                 Region(),
@@ -481,7 +737,7 @@ class ConvertMemrefToRiscvPass(ModulePass):
                 visibility="private",
             )
             SymbolTable.insert_or_update(op, func_op)
-        if contains_dealloc:
+        if dealloc_pattern.contains_dealloc:
             func_op = riscv_func.FuncOp(
                 "free",
                 Region(),
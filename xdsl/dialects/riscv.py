@@ -1542,7 +1542,7 @@ class SlliOp(RdRsImmShiftOperation):
 
     name = "riscv.slli"
 
-    traits = frozenset((SlliOpHasCanonicalizationPatternsTrait(),))
+    traits = frozenset((Pure(), SlliOpHasCanonicalizationPatternsTrait()))
 
 
 @irdl_op_definition
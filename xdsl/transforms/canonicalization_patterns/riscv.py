@@ -189,17 +189,12 @@ class SubAddi(RewritePattern):
 class ShiftLeftImmediate(RewritePattern):
     @op_type_rewrite_pattern
     def match_and_rewrite(self, op: riscv.SlliOp, rewriter: PatternRewriter) -> None:
-        if (
-            isinstance(op.rs1, OpResult)
-            and isinstance(op.rs1.op, riscv.LiOp)
-            and isinstance(op.rs1.op.immediate, IntegerAttr)
-            and isinstance(op.immediate, IntegerAttr)
+        if (rs1 := get_constant_value(op.rs1)) is not None and isinstance(
+            op.immediate, IntegerAttr
         ):
             rd = cast(riscv.IntRegisterType, op.rd.type)
             rewriter.replace_matched_op(
-                riscv.LiOp(
-                    op.rs1.op.immediate.value.data << op.immediate.value.data, rd=rd
-                )
+                riscv.LiOp(rs1.value.data << op.immediate.value.data, rd=rd)
             )
 
 